@@ -16,32 +16,68 @@ starts/stops A/V recording based on human presence detection.
 Visual status indicators via LEDs provide real-time feedback.
 """
 
-import board
-import busio
-import adafruit_amg88xx
+import os
 import subprocess
 import time
 import logging
-from datetime import datetime
+import logging.handlers
+import queue
+import selectors
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from enum import Enum
+from dataclasses import dataclass
 import signal
 import sys
-import json
+import threading
 import socket
 from typing import Optional
-from gpiozero import LED
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
+from ir_sensor import IRSensor
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # Optional: stdlib parser accepts bytes too
+    from json import loads as json_loads
+
+logger = logging.getLogger(__name__)
+
+# stderr of rpicam-vid/arecord (kept out of pipes nobody drains)
+RECORDER_LOG = '/var/log/av_monitor_rpicam.log'
+
+# Opened once and shared by every spawn, instead of subprocess.DEVNULL
+# opening and closing /dev/null per child stream
+_DEVNULL_FD = os.open(os.devnull, os.O_RDWR | os.O_CLOEXEC)
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Configure logging to file and console
+    
+    Records are queued by the caller and written by a background listener
+    thread, so slow SD-card writes never stall the monitor loop.
+    
+    Returns:
+        The started listener; stop it on exit to flush pending records
+    """
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [
         logging.FileHandler('/var/log/av_monitor.log'),
         logging.StreamHandler(sys.stdout)
     ]
-)
-logger = logging.getLogger(__name__)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()  # Cheaper put() than queue.Queue (no Condition)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    return listener
 
 
 class RecordingState(Enum):
@@ -51,48 +87,68 @@ class RecordingState(Enum):
     WAITING_TO_STOP = "waiting_to_stop"
 
 
+# Defaults for every Config field; the config file overrides a subset
+_CONFIG_DEFAULTS = {
+    "capture_dir": str(Path.home() / "captures"),
+    "temperature_threshold": 28.0,  # Celsius for human detection
+    "presence_pixels_required": 3,  # Min pixels above threshold
+    "stop_delay_seconds": 60,
+    "poll_interval_seconds": 0.5,
+    "video_resolution": "1920x1080",
+    "video_framerate": 30,
+    "audio_samplerate": 48000,
+    "audio_channels": 2,
+    "video_codec": "h264",  # or "h265"
+    "audio_device": "plughw:2,0",  # WM8960 ALSA device
+    "autofocus_mode": "auto",  # Autofocus mode for camera
+    "int_pin": None,  # GPIO wired to AMG8833 INT (None = poll)
+}
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Configuration settings"""
-    def __init__(self, config_path: str = "/etc/av_monitor/config.json"):
-        self.config_path = config_path
-        self.load_config()
+    """Configuration settings (immutable once loaded)"""
+    capture_dir: str
+    temperature_threshold: float  # Celsius for human detection
+    presence_pixels_required: int  # Min pixels above threshold
+    stop_delay_seconds: float
+    poll_interval_seconds: float
+    video_resolution: str
+    video_framerate: int
+    audio_samplerate: int
+    audio_channels: int
+    video_codec: str  # "h264" or "h265"
+    audio_device: str  # ALSA device string
+    autofocus_mode: str  # Autofocus mode for camera
+    int_pin: Optional[int]  # GPIO wired to AMG8833 INT (None = poll)
     
-    def load_config(self):
+    @classmethod
+    def load(cls, config_path: str = "/etc/av_monitor/config.json") -> "Config":
         """Load configuration from file or use defaults"""
-        defaults = {
-            "capture_dir": str(Path.home() / "captures"),
-            "temperature_threshold": 28.0,  # Celsius for human detection
-            "presence_pixels_required": 3,  # Min pixels above threshold
-            "stop_delay_seconds": 60,
-            "poll_interval_seconds": 0.5,
-            "video_resolution": "1920x1080",
-            "video_framerate": 30,
-            "audio_samplerate": 48000,
-            "audio_channels": 2,
-            "video_codec": "h264",  # or "h265"
-            "audio_device": "plughw:2,0",  # WM8960 ALSA device
-            "autofocus_mode": "auto",  # Autofocus mode for camera
-        }
-        
+        config = _CONFIG_DEFAULTS
         try:
-            if Path(self.config_path).exists():
-                with open(self.config_path, 'r') as f:
-                    user_config = json.load(f)
-                    defaults.update(user_config)
-                logger.info(f"Loaded configuration from {self.config_path}")
+            user_config = json_loads(Path(config_path).read_bytes())
+            unknown = user_config.keys() - _CONFIG_DEFAULTS.keys()
+            if unknown:
+                logger.warning(f"Ignoring unknown config keys: {', '.join(sorted(unknown))}")
+            config = _CONFIG_DEFAULTS | {
+                k: v for k, v in user_config.items() if k in _CONFIG_DEFAULTS
+            }
+            logger.info(f"Loaded configuration from {config_path}")
+        except FileNotFoundError:
+            pass  # No config file: use defaults
         except Exception as e:
             logger.warning(f"Could not load config file, using defaults: {e}")
         
-        # Set attributes
-        for key, value in defaults.items():
-            setattr(self, key, value)
-        
-        # Ensure capture directory exists
-        Path(self.capture_dir).mkdir(parents=True, exist_ok=True)
+        return cls(**config)
 
 
 class StatusLEDs:
-    """Status LED controller for visual feedback"""
+    """Status LED controller for visual feedback (sysfs GPIO, one write per toggle)"""
+    GPIO_SYSFS = Path('/sys/class/gpio')
+    # gpiochip labels of the 40-pin header controller (Pi 5, Pi 4, older)
+    HEADER_CHIPS = ('pinctrl-rp1', 'pinctrl-bcm2711', 'pinctrl-bcm2835')
+    
     def __init__(self, orange_pin: int = 6, red_pin: int = 26):
         """
         Initialize status LEDs
@@ -101,97 +157,200 @@ class StatusLEDs:
             orange_pin: GPIO pin for orange LED (monitoring/idle)
             red_pin: GPIO pin for red LED (recording)
         """
-        self.orange_led = LED(orange_pin)
-        self.red_led = LED(red_pin)
+        base = self._header_base()
+        self._gpios = (base + orange_pin, base + red_pin)
+        self._orange_fd = self._export_output(base + orange_pin)
+        self._red_fd = self._export_output(base + red_pin)
         logger.info(f"Status LEDs initialized (Orange: GPIO{orange_pin}, Red: GPIO{red_pin})")
         
         # Start with orange LED on (system idle/monitoring)
         self.set_idle()
     
+    @classmethod
+    def _header_base(cls) -> int:
+        """Global sysfs number of header GPIO 0 (non-zero on the Pi 5)"""
+        for chip in cls.GPIO_SYSFS.glob('gpiochip*'):
+            try:
+                if (chip / 'label').read_text().strip() in cls.HEADER_CHIPS:
+                    return int((chip / 'base').read_text())
+            except (OSError, ValueError):
+                continue
+        return 0
+    
+    @classmethod
+    def _export_output(cls, gpio: int) -> int:
+        """
+        Export a GPIO as a low output and open its value file
+        
+        Args:
+            gpio: Global sysfs GPIO number
+        
+        Returns:
+            Write-only file descriptor for the pin's value
+        """
+        path = cls.GPIO_SYSFS / f'gpio{gpio}'
+        if not path.exists():
+            (cls.GPIO_SYSFS / 'export').write_text(str(gpio))
+        # udev hands the new files to the gpio group a moment after export
+        for _ in range(20):
+            try:
+                (path / 'direction').write_text('low')
+                return os.open(path / 'value', os.O_WRONLY)
+            except PermissionError:
+                time.sleep(0.05)
+        (path / 'direction').write_text('low')
+        return os.open(path / 'value', os.O_WRONLY)
+    
     def set_idle(self):
         """Set LEDs to idle state (orange on, red off)"""
-        self.orange_led.on()
-        self.red_led.off()
+        os.write(self._orange_fd, b'1')
+        os.write(self._red_fd, b'0')
         logger.debug("LED Status: IDLE (orange)")
     
     def set_recording(self):
         """Set LEDs to recording state (orange off, red on)"""
-        self.orange_led.off()
-        self.red_led.on()
+        os.write(self._orange_fd, b'0')
+        os.write(self._red_fd, b'1')
         logger.debug("LED Status: RECORDING (red)")
     
     def set_waiting(self):
         """Set LEDs to waiting state (red blinking)"""
         # Keep red on during waiting period
-        self.orange_led.off()
-        self.red_led.on()
+        os.write(self._orange_fd, b'0')
+        os.write(self._red_fd, b'1')
         logger.debug("LED Status: WAITING (red)")
     
     def cleanup(self):
-        """Turn off all LEDs"""
-        self.orange_led.off()
-        self.red_led.off()
+        """Turn off all LEDs and release the pins"""
+        for fd in (self._orange_fd, self._red_fd):
+            os.write(fd, b'0')
+            os.close(fd)
+        for gpio in self._gpios:
+            try:
+                (self.GPIO_SYSFS / 'unexport').write_text(str(gpio))
+            except OSError:
+                pass
         logger.debug("LED Status: OFF")
 
 
-class IRSensor:
-    """AMG8833 IR thermal sensor interface"""
-    def __init__(self, threshold: float = 28.0, min_pixels: int = 3):
-        self.threshold = threshold
-        self.min_pixels = min_pixels
-        self.sensor = None
-        self.initialize()
-    
-    def initialize(self):
-        """Initialize I2C connection to AMG8833"""
-        try:
-            i2c = busio.I2C(board.SCL, board.SDA)
-            self.sensor = adafruit_amg88xx.AMG88XX(i2c)
-            logger.info("AMG8833 IR sensor initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize AMG8833: {e}")
-            raise
-    
-    def detect_presence(self) -> bool:
-        """
-        Detect human presence based on thermal signature
-        
-        Returns:
-            True if human-like heat signature detected, False otherwise
-        """
-        try:
-            # Read 8x8 thermal grid
-            pixels = self.sensor.pixels
-            
-            # Count pixels above threshold
-            hot_pixels = 0
-            for row in pixels:
-                for temp in row:
-                    if temp >= self.threshold:
-                        hot_pixels += 1
-            
-            presence = hot_pixels >= self.min_pixels
-            
-            if presence:
-                logger.debug(f"Presence detected: {hot_pixels} pixels above {self.threshold}°C")
-            
-            return presence
-            
-        except Exception as e:
-            logger.error(f"Error reading IR sensor: {e}")
-            return False
-
-
 class AVRecorder:
-    """Manages audio/video recording (separate streams, merged on stop)"""
+    """Manages audio/video recording (live streams muxed by one ffmpeg)"""
+    # ffmpeg muxers (live plus finalizing) allowed at once; each holds a
+    # slot from start_recording until its MP4 is finished
+    MAX_MUXERS = max(2, (os.cpu_count() or 2) // 2)
+    # Seconds for ffmpeg to flush the last fragment once its inputs hit EOF
+    FINALIZE_TIMEOUT = 30
+    # Longest start_recording waits to confirm the pipeline is running
+    STARTUP_TIMEOUT = 0.5
+    
     def __init__(self, config: Config):
         self.config = config
         self.video_process: Optional[subprocess.Popen] = None
         self.audio_process: Optional[subprocess.Popen] = None
+        self.mux_process: Optional[subprocess.Popen] = None
         self.current_file: Optional[Path] = None
-        self.temp_video_file: Optional[Path] = None
-        self.temp_audio_file: Optional[Path] = None
         self.hostname = socket.gethostname()  # Get device hostname
+        self._log = self._open_log()
+        self._capdir = Path(config.capture_dir)
+        self._last_day_dir: Optional[Path] = None  # Last YYYY/MM/DD dir created
+        # MP4s are finalized off the monitor loop, one at a time
+        self._finalize_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="finalize")
+        self._mux_slots = threading.BoundedSemaphore(self.MAX_MUXERS)
+        self._holds_slot = False  # Whether the current recording has a slot
+        self._slots_exhausted = False  # Refusal already logged
+        # YYYY/MM/DD/MMDDYYYY_hostname_HHMMSS.mp4 ('%' escaped for strftime)
+        self._fmt = f"%Y/%m/%d/%m%d%Y_{self.hostname.replace('%', '%%')}_%H%M%S.mp4"
+        
+        # CPU placement on the Pi 5's four cores: the monitor stays on CPU0
+        # (see MonitorSystem), the camera gets CPUs 1-2, audio capture and
+        # the reniced muxer share CPU3. taskset/nice exec the real command,
+        # so placement applies before it spawns any threads.
+        if (os.cpu_count() or 1) >= 4:
+            video_prefix = ('taskset', '-c', '1,2')
+            audio_prefix = ('taskset', '-c', '3')
+            mux_prefix = ('nice', '-n', '5', 'taskset', '-c', '3')
+        else:
+            video_prefix = audio_prefix = mux_prefix = ()
+        
+        # Static parts of the recorder commands (only output paths vary)
+        width, height = config.video_resolution.split('x')
+        self._audio_cmd_static = (
+            *audio_prefix,
+            'arecord',
+            '-q',  # No banner; RECORDER_LOG only gets errors
+            '-D', config.audio_device,
+            '-t', 'raw',
+            '-f', 'S16_LE',
+            '-r', str(config.audio_samplerate),
+            '-c', str(config.audio_channels),
+        )
+        self._video_cmd_static = (
+            *video_prefix,
+            'rpicam-vid',
+            '-t', '0',  # Infinite duration (we'll stop manually)
+            '--width', width,
+            '--height', height,
+            '--framerate', str(config.video_framerate),
+            '--codec', config.video_codec,
+            '--autofocus-mode', config.autofocus_mode,
+            '--inline',  # Repeat SPS/PPS on every keyframe (self-contained fragments)
+            '--nopreview',
+            '--verbose', '0',  # No per-frame stderr lines in RECORDER_LOG
+        )
+        # ffmpeg muxer, split around its one variable input (the audio fd);
+        # the output path is appended last
+        video_demuxer = {'h265': 'hevc'}.get(config.video_codec, config.video_codec)
+        self._mux_cmd_prefix = (
+            *mux_prefix,
+            'ffmpeg',
+            '-hide_banner', '-nostats', '-loglevel', 'warning',
+            '-thread_queue_size', '512',
+            '-f', video_demuxer,  # rpicam-vid's raw elementary stream
+            '-framerate', str(config.video_framerate),
+            '-i', 'pipe:0',
+            '-thread_queue_size', '512',
+            '-f', 's16le',
+            '-ar', str(config.audio_samplerate),
+            '-ac', str(config.audio_channels),
+            '-i',
+        )
+        self._mux_cmd_suffix = (
+            '-c:v', 'copy',  # Copy video stream (no re-encode)
+            '-c:a', 'aac',   # Encode audio to AAC
+            '-threads', '1', # One encoder thread; it shares CPU3
+            '-shortest',     # Match shortest stream duration
+            # Fragmented MP4: playable as written, nothing to rewrite at stop
+            '-movflags', '+frag_keyframe+empty_moov',
+            '-f', 'mp4',
+            '-y',            # Overwrite output file
+        )
+    
+    @staticmethod
+    def _open_log():
+        """Open the recorder stderr log, falling back to /dev/null"""
+        try:
+            return open(RECORDER_LOG, 'ab', buffering=0)
+        except OSError as e:
+            logger.warning(f"Cannot open {RECORDER_LOG}, discarding recorder output: {e}")
+            return None
+    
+    def _log_tail(self, limit: int = 2048) -> str:
+        """Return the most recent recorder output for error reports"""
+        if self._log is None:
+            return ""
+        try:
+            with open(RECORDER_LOG, 'rb') as f:
+                f.seek(max(0, os.fstat(f.fileno()).st_size - limit))
+                return f.read().decode(errors='replace').strip()
+        except OSError:
+            return ""
+    
+    def close(self):
+        """Wait for pending recordings to finalize and release the log file"""
+        self._finalize_pool.shutdown(wait=True)
+        if self._log is not None:
+            self._log.close()
+            self._log = None
     
     def generate_filename(self) -> Path:
         """
@@ -200,28 +359,23 @@ class AVRecorder:
         Structure: /mnt/nas/dt/raw/YYYY/MM/DD/MMDDYYYY_hostname_HHMMSS.mp4
         Example: /mnt/nas/dt/raw/2025/11/09/11092025_sauron-unit-1_143022.mp4
         """
-        now = datetime.now()
-        
-        # Create year/month/day folder structure
-        year_folder = now.strftime("%Y")
-        month_folder = now.strftime("%m")
-        day_folder = now.strftime("%d")
-        
-        capture_path = Path(self.config.capture_dir) / year_folder / month_folder / day_folder
+        filepath = self._capdir / time.strftime(self._fmt)
         
-        # Create directories if they don't exist
-        capture_path.mkdir(parents=True, exist_ok=True)
+        # Create year/month/day directories only when the day rolls over
+        day_dir = filepath.parent
+        if day_dir != self._last_day_dir:
+            day_dir.mkdir(parents=True, exist_ok=True)
+            self._last_day_dir = day_dir
         
-        # Generate filename: MMDDYYYY_hostname_HHMMSS.mp4
-        date_str = now.strftime("%m%d%Y")
-        time_str = now.strftime("%H%M%S")
-        filename = f"{date_str}_{self.hostname}_{time_str}.mp4"
-        
-        return capture_path / filename
+        return filepath
     
     def start_recording(self) -> bool:
         """
-        Start audio and video recording (separate processes)
+        Start audio and video capture piped into a single ffmpeg muxer
+        
+        arecord (raw PCM) and rpicam-vid (raw H.264) write to pipes that
+        ffmpeg reads directly, so the MP4 is produced in one pass with no
+        temporary files and no merge step after stopping.
         
         Returns:
             True if recording started successfully, False otherwise
@@ -230,74 +384,81 @@ class AVRecorder:
             logger.warning("Recording already in progress")
             return False
         
-        self.current_file = self.generate_filename()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Store temp files in /tmp to avoid cluttering NAS
-        self.temp_video_file = Path(f"/tmp/temp_video_{timestamp}.mp4")
-        self.temp_audio_file = Path(f"/tmp/temp_audio_{timestamp}.wav")
-        
-        width, height = self.config.video_resolution.split('x')
+        # Refuse to pile up ffmpeg muxers while earlier MP4s are finalizing.
+        # Checked first, and warned about once per episode, since presence
+        # retries this on every tick.
+        if not self._mux_slots.acquire(blocking=False):
+            if not self._slots_exhausted:
+                logger.warning(f"{self.MAX_MUXERS} recordings still finalizing, not starting another")
+                self._slots_exhausted = True
+            return False
+        self._holds_slot = True
+        self._slots_exhausted = False
         
-        # Build audio recording command (arecord)
-        audio_cmd = [
-            'arecord',
-            '-D', self.config.audio_device,
-            '-f', 'S16_LE',
-            '-r', str(self.config.audio_samplerate),
-            '-c', str(self.config.audio_channels),
-            str(self.temp_audio_file)
-        ]
+        # Audio recording command (arecord, raw PCM to stdout)
+        audio_cmd = (*self._audio_cmd_static, '-')
         
-        # Build video recording command (rpicam-vid, NO audio)
-        video_cmd = [
-            'rpicam-vid',
-            '-t', '0',  # Infinite duration (we'll stop manually)
-            '--width', width,
-            '--height', height,
-            '--framerate', str(self.config.video_framerate),
-            '--codec', self.config.video_codec,
-            '--autofocus-mode', self.config.autofocus_mode,
-            '-o', str(self.temp_video_file),
-            '--nopreview',
-        ]
+        # Video recording command (rpicam-vid, NO audio, H.264 to stdout)
+        video_cmd = (*self._video_cmd_static, '-o', '-')
         
         try:
+            self.current_file = self.generate_filename()
             logger.info(f"Starting recording: {self.current_file}")
-            logger.debug(f"Audio command: {' '.join(audio_cmd)}")
-            logger.debug(f"Video command: {' '.join(video_cmd)}")
+            
+            # Children run in their own session so a terminal Ctrl-C only
+            # reaches this process; no preexec_fn keeps the vfork fast path
             
             # Start audio recording first
             self.audio_process = subprocess.Popen(
                 audio_cmd,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                preexec_fn=lambda: signal.signal(signal.SIGINT, signal.SIG_IGN)
+                stderr=self._log or _DEVNULL_FD,
+                start_new_session=True
             )
             
             # Start video recording immediately after
             self.video_process = subprocess.Popen(
                 video_cmd,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                preexec_fn=lambda: signal.signal(signal.SIGINT, signal.SIG_IGN)
+                stderr=self._log or _DEVNULL_FD,
+                start_new_session=True
             )
             
-            # Give them a moment to start
-            time.sleep(0.5)
+            # Mux both pipes: video on stdin, audio on its inherited fd
+            audio_fd = self.audio_process.stdout.fileno()
+            mux_cmd = (
+                *self._mux_cmd_prefix, f'pipe:{audio_fd}',
+                *self._mux_cmd_suffix, str(self.current_file)
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Audio command: %s", ' '.join(audio_cmd))
+                logger.debug("Video command: %s", ' '.join(video_cmd))
+                logger.debug("Mux command: %s", ' '.join(mux_cmd))
             
-            # Check if processes started successfully
-            if self.audio_process.poll() is not None:
-                _, stderr = self.audio_process.communicate()
-                logger.error(f"arecord failed to start: {stderr.decode()}")
-                self._cleanup_failed_start()
-                return False
+            self.mux_process = subprocess.Popen(
+                mux_cmd,
+                stdin=self.video_process.stdout,
+                stdout=_DEVNULL_FD,
+                stderr=self._log or _DEVNULL_FD,
+                pass_fds=(audio_fd,),
+                start_new_session=True
+            )
             
-            if self.video_process.poll() is not None:
-                _, stderr = self.video_process.communicate()
-                logger.error(f"rpicam-vid failed to start: {stderr.decode()}")
-                self._cleanup_failed_start()
-                return False
+            # ffmpeg holds the read ends now; drop ours so EOF propagates
+            self.audio_process.stdout.close()
+            self.video_process.stdout.close()
+            
+            # Return as soon as ffmpeg writes the MP4 header or a process dies
+            self._await_startup((self.audio_process, self.video_process, self.mux_process))
+            
+            # Check if processes started successfully
+            for process, name in ((self.audio_process, "arecord"),
+                                  (self.video_process, "rpicam-vid"),
+                                  (self.mux_process, "ffmpeg")):
+                if process.poll() is not None:
+                    logger.error(f"{name} failed to start: {self._log_tail()}")
+                    self._cleanup_failed_start()
+                    return False
             
             logger.info("Audio and video recording started successfully")
             return True
@@ -307,34 +468,63 @@ class AVRecorder:
             self._cleanup_failed_start()
             return False
     
-    def _cleanup_failed_start(self):
-        """Clean up after failed recording start"""
-        if self.audio_process:
-            try:
-                self.audio_process.kill()
-                self.audio_process.wait()
-            except:
-                pass
-            self.audio_process = None
+    def _await_startup(self, processes):
+        """
+        Wait until the MP4 has a header, any process exits, or STARTUP_TIMEOUT
         
-        if self.video_process:
+        Args:
+            processes: Recorder processes whose exit ends the wait early
+        """
+        deadline = time.monotonic() + self.STARTUP_TIMEOUT
+        with selectors.DefaultSelector() as exits:
             try:
-                self.video_process.kill()
-                self.video_process.wait()
-            except:
-                pass
-            self.video_process = None
+                # A pidfd turns readable when its process exits. Registered
+                # inside the try so a failed pidfd_open still closes the rest.
+                for process in processes:
+                    exits.register(os.pidfd_open(process.pid), selectors.EVENT_READ)
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or exits.select(timeout=min(remaining, 0.05)):
+                        return
+                    try:
+                        if os.stat(self.current_file).st_size > 0:
+                            return  # Header written: both streams are flowing
+                    except FileNotFoundError:
+                        pass
+            finally:
+                for key in list(exits.get_map().values()):
+                    os.close(key.fd)
+    
+    def _cleanup_failed_start(self):
+        """Clean up after failed recording start"""
+        for process in (self.audio_process, self.video_process, self.mux_process):
+            if process:
+                try:
+                    process.kill()
+                    process.wait()
+                except:
+                    pass
+                if process.stdout:
+                    process.stdout.close()
         
+        self.audio_process = None
+        self.video_process = None
+        self.mux_process = None
         self.current_file = None
-        self.temp_audio_file = None
-        self.temp_video_file = None
+        self._release_slot()
+        # The day directory may have vanished (e.g. NAS remount); recheck next time
+        self._last_day_dir = None
     
     def stop_recording(self) -> bool:
         """
-        Stop recording gracefully and merge audio/video
+        Stop capture and hand the MP4 to a background worker to finalize
+        
+        The capture processes are stopped here; waiting for ffmpeg to write
+        the last fragment happens on the finalize worker so monitoring resumes
+        immediately.
         
         Returns:
-            True if stopped successfully, False otherwise
+            True if capture stopped and finalization was queued, False otherwise
         """
         if self.video_process is None and self.audio_process is None:
             logger.warning("No recording in progress")
@@ -345,212 +535,361 @@ class AVRecorder:
             
             # Stop video process (SIGINT for graceful shutdown)
             if self.video_process:
-                self.video_process.send_signal(signal.SIGINT)
-                try:
-                    self.video_process.wait(timeout=10)
-                except subprocess.TimeoutExpired:
-                    logger.warning("Video process didn't stop gracefully, forcing termination")
-                    self.video_process.kill()
-                    self.video_process.wait()
+                self._stop_process_group(self.video_process, "Video", signal.SIGINT, 10)
             
             # Stop audio process (SIGTERM for arecord)
             if self.audio_process:
-                self.audio_process.terminate()
-                try:
-                    self.audio_process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    logger.warning("Audio process didn't stop gracefully, forcing termination")
-                    self.audio_process.kill()
-                    self.audio_process.wait()
-            
-            # Check if temp files exist
-            if not self.temp_video_file or not self.temp_video_file.exists():
-                logger.error(f"Temporary video file not found: {self.temp_video_file}")
-                self._cleanup_recording()
-                return False
-            
-            if not self.temp_audio_file or not self.temp_audio_file.exists():
-                logger.error(f"Temporary audio file not found: {self.temp_audio_file}")
-                self._cleanup_recording()
-                return False
+                self._stop_process_group(self.audio_process, "Audio", signal.SIGTERM, 5)
             
-            # Merge audio and video with ffmpeg
-            logger.info("Merging audio and video...")
-            merge_success = self._merge_av_files()
-            
-            if merge_success:
-                # Delete temporary files
-                try:
-                    self.temp_video_file.unlink()
-                    self.temp_audio_file.unlink()
-                    logger.info("Temporary files cleaned up")
-                except Exception as e:
-                    logger.warning(f"Could not delete temporary files: {e}")
-                
-                file_size = self.current_file.stat().st_size
-                logger.info(f"Recording saved: {self.current_file} ({file_size} bytes)")
-            else:
-                logger.error("Failed to merge audio and video")
+            # Both pipes are at EOF: ffmpeg flushes the last fragment and exits.
+            # Pass this recording's state by value; self.* is reused next start
+            if self.mux_process:
+                future = self._finalize_pool.submit(
+                    self._finalize,
+                    self.mux_process,
+                    self.current_file,
+                    self.FINALIZE_TIMEOUT
+                )
+                # The slot now belongs to the finalize job
+                self._holds_slot = False
+                future.add_done_callback(lambda _: self._mux_slots.release())
             
             self._cleanup_recording()
-            return merge_success
+            return True
             
         except Exception as e:
             logger.error(f"Error stopping recording: {e}")
             self._cleanup_recording()
             return False
     
-    def _merge_av_files(self) -> bool:
+    def _finalize(self, mux_process: subprocess.Popen, output: Path, timeout: float) -> bool:
         """
-        Merge audio and video files using ffmpeg
+        Wait for ffmpeg to finish an MP4 (runs on the finalize worker)
+        
+        Args:
+            mux_process: ffmpeg muxer whose inputs have reached EOF
+            output: MP4 the muxer is writing
+            timeout: Seconds to allow before interrupting ffmpeg
         
         Returns:
-            True if merge successful, False otherwise
+            True if the MP4 was written successfully, False otherwise
         """
-        merge_cmd = [
-            'ffmpeg',
-            '-i', str(self.temp_video_file),
-            '-i', str(self.temp_audio_file),
-            '-c:v', 'copy',  # Copy video stream (no re-encode)
-            '-c:a', 'aac',   # Encode audio to AAC
-            '-shortest',     # Match shortest stream duration
-            '-y',            # Overwrite output file
-            str(self.current_file)
-        ]
-        
         try:
-            logger.debug(f"Merge command: {' '.join(merge_cmd)}")
-            result = subprocess.run(
-                merge_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                timeout=30
-            )
+            interrupted = False
+            try:
+                mux_process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                logger.warning("ffmpeg didn't finish the MP4 in time, interrupting")
+                self._stop_process_group(mux_process, "Mux", signal.SIGINT, 10)
+                interrupted = True
             
-            if result.returncode == 0:
-                logger.info("Audio/video merge successful")
-                return True
-            else:
-                logger.error(f"ffmpeg merge failed: {result.stderr.decode()}")
+            # After our own interrupt a nonzero exit is expected; the
+            # fragments already written still play
+            if mux_process.returncode != 0 and not interrupted:
+                logger.error(f"ffmpeg failed to write the recording: {self._log_tail()}")
                 return False
-                
-        except subprocess.TimeoutExpired:
-            logger.error("ffmpeg merge timed out")
-            return False
+            
+            try:
+                st = os.stat(output)
+            except FileNotFoundError:
+                logger.error(f"Recording not found: {output}")
+                return False
+            if interrupted:
+                if not st.st_size:
+                    logger.error(f"Interrupted ffmpeg left an empty recording: {output}")
+                    return False
+                logger.warning(
+                    f"Recording saved after interrupting ffmpeg, may lack its last "
+                    f"fragment: {output} ({st.st_size} bytes)"
+                )
+                return True
+            logger.info(f"Recording saved: {output} ({st.st_size} bytes)")
+            return True
+            
         except Exception as e:
-            logger.error(f"Error running ffmpeg: {e}")
+            logger.error(f"Error finalizing recording {output}: {e}")
             return False
     
+    @staticmethod
+    def _stop_process_group(process: subprocess.Popen, name: str,
+                            sig: signal.Signals, timeout: float):
+        """
+        Stop a recorder and any helpers it spawned, escalating stepwise
+        
+        Args:
+            process: Process started as its own session/group leader
+            name: Label used in log messages
+            sig: Signal requesting a graceful stop
+            timeout: Seconds to wait before escalating
+        """
+        steps = [(sig, timeout)]
+        if sig != signal.SIGTERM:
+            steps.append((signal.SIGTERM, 5))
+        steps.append((signal.SIGKILL, None))
+        
+        for step_sig, step_timeout in steps:
+            try:
+                os.killpg(process.pid, step_sig)
+            except ProcessLookupError:
+                pass  # Group already gone; still reap below
+            try:
+                process.wait(timeout=step_timeout)
+                return
+            except subprocess.TimeoutExpired:
+                logger.warning(f"{name} process didn't stop after {step_sig.name}, escalating")
+    
+    def _release_slot(self):
+        """Return the current recording's muxer slot, if it still holds one"""
+        if self._holds_slot:
+            self._holds_slot = False
+            self._mux_slots.release()
+    
     def _cleanup_recording(self):
         """Clean up recording state"""
+        self._release_slot()
         self.video_process = None
         self.audio_process = None
+        self.mux_process = None
         self.current_file = None
-        self.temp_video_file = None
-        self.temp_audio_file = None
     
     def is_recording(self) -> bool:
         """Check if currently recording"""
-        video_active = self.video_process is not None and self.video_process.poll() is None
-        audio_active = self.audio_process is not None and self.audio_process.poll() is None
-        return video_active or audio_active
+        return any(
+            process is not None and process.poll() is None
+            for process in (self.video_process, self.audio_process, self.mux_process)
+        )
 
 
 class MonitorSystem:
     """Main monitoring system coordinator"""
     def __init__(self, config: Config):
         self.config = config
+        # Keep monitoring on CPU0, clear of the recorders (see AVRecorder).
+        # Set before any threads start here so they inherit it.
+        if (os.cpu_count() or 1) >= 4:
+            os.sched_setaffinity(0, {0})
+        # Ensure capture directory exists (once per process, not per load)
+        Path(config.capture_dir).mkdir(parents=True, exist_ok=True)
         self.status_leds = StatusLEDs()  # Initialize LED indicators
         self.ir_sensor = IRSensor(
             threshold=config.temperature_threshold,
-            min_pixels=config.presence_pixels_required
+            min_pixels=config.presence_pixels_required,
+            interrupt=config.int_pin is not None
         )
+        # AMG8833 INT is open-drain, active low
+        self.int_line = None
+        if config.int_pin is not None:
+            # Only the INT line needs gpiozero (sysfs can't set the pull-up)
+            from gpiozero import Button
+            self.int_line = Button(config.int_pin, pull_up=True)
         self.recorder = AVRecorder(config)
         self.state = RecordingState.IDLE
-        self.absence_timer: Optional[float] = None
+        self._stop_deadline: Optional[float] = None  # monotonic, set in WAITING_TO_STOP
         self.running = True
+        self._signal_received: Optional[int] = None
+        # Latest presence reading, published by the sensor thread
+        self._presence = threading.Event()
+        # Self-pipe woken by presence changes and (via set_wakeup_fd) signals
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
     
     def handle_signal(self, signum, frame):
         """Handle system signals for graceful shutdown"""
-        logger.info(f"Received signal {signum}, shutting down...")
+        # Only flag the loop (set_wakeup_fd already woke it); run() logs and
+        # its finally block stops the recorder, so neither logging nor a
+        # signal landing mid-stop_recording() can re-enter locked code
+        self._signal_received = signum
         self.running = False
-        if self.recorder.is_recording():
-            self.recorder.stop_recording()
-        self.status_leds.cleanup()  # Turn off LEDs
-        sys.exit(0)
+    
+    def _wake(self):
+        """Interrupt the main loop's wait"""
+        try:
+            os.write(self._wake_w, b'\0')
+        except BlockingIOError:
+            pass  # Pipe full: a wake-up is already pending
+    
+    def _wait(self, timeout: Optional[float]):
+        """Sleep until timeout (None: no limit), a presence change, or a signal arrives"""
+        if self._selector.select(timeout=timeout):
+            try:
+                while os.read(self._wake_r, 512):
+                    pass
+            except BlockingIOError:
+                pass
+    
+    def _sense_loop(self):
+        """Sensor thread: read the IR sensor and publish presence changes"""
+        # Leave SIGINT/SIGTERM to the main thread
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT, signal.SIGTERM})
+        
+        poll_interval = self.config.poll_interval_seconds
+        stop_delay = self.config.stop_delay_seconds
+        min_pixels = self.config.presence_pixels_required
+        IDLE = RecordingState.IDLE
+        int_line = self.int_line
+        sensor = self.ir_sensor
+        detect = sensor.detect_presence
+        published = self._presence
+        monotonic = time.monotonic
+        sleep = time.sleep
+        
+        next_tick = monotonic()
+        while self.running:
+            confirm = True
+            if int_line is not None and self.state is IDLE:
+                # Sleep until the sensor raises INT instead of polling I2C
+                if int_line.wait_for_active(timeout=stop_delay):
+                    # INT fires on a single pixel; only read a full frame once
+                    # enough pixels have tripped (the timeout path always reads)
+                    confirm = sensor.interrupt_pixel_count() >= min_pixels
+                sensor.clear_interrupt()
+                next_tick = monotonic()
+            
+            presence = detect() if confirm else False
+            if presence != published.is_set():
+                if presence:
+                    published.set()
+                else:
+                    published.clear()
+                # Let the state machine react without waiting out its tick
+                self._wake()
+            
+            # Keep a fixed cadence regardless of how long the read took
+            next_tick += poll_interval
+            delay = next_tick - monotonic()
+            if delay > 0:
+                sleep(delay)
+            else:
+                next_tick = monotonic()  # Overran; don't try to catch up
     
     def run(self):
         """Main monitoring loop"""
         # Register signal handlers
         signal.signal(signal.SIGINT, self.handle_signal)
         signal.signal(signal.SIGTERM, self.handle_signal)
+        # Signal delivery writes to the self-pipe, so the wait ends at once
+        signal.set_wakeup_fd(self._wake_w)
+        
+        # One record instead of one per line: a single lock/format/write
+        ir_trigger = f"GPIO{self.config.int_pin} interrupt" if self.int_line else "polling"
+        logger.info(
+            "=== A/V Monitoring System Started ===\n"
+            "Configuration:\n"
+            "  Capture directory: %s\n"
+            "  Temperature threshold: %s°C\n"
+            "  Stop delay: %ss\n"
+            "  IR trigger: %s\n"
+            "  Video: %s @ %sfps\n"
+            "  Audio: %sHz, %sch\n"
+            "Monitoring for presence...",
+            self.config.capture_dir,
+            self.config.temperature_threshold,
+            self.config.stop_delay_seconds,
+            ir_trigger,
+            self.config.video_resolution, self.config.video_framerate,
+            self.config.audio_samplerate, self.config.audio_channels,
+        )
         
-        logger.info("=== A/V Monitoring System Started ===")
-        logger.info(f"Configuration:")
-        logger.info(f"  Capture directory: {self.config.capture_dir}")
-        logger.info(f"  Temperature threshold: {self.config.temperature_threshold}°C")
-        logger.info(f"  Stop delay: {self.config.stop_delay_seconds}s")
-        logger.info(f"  Video: {self.config.video_resolution} @ {self.config.video_framerate}fps")
-        logger.info(f"  Audio: {self.config.audio_samplerate}Hz, {self.config.audio_channels}ch")
-        logger.info("Monitoring for presence...")
+        threading.Thread(target=self._sense_loop, name="ir-sensor", daemon=True).start()
         
+        # Config is frozen; bind loop constants and hot lookups once
+        poll_interval = self.config.poll_interval_seconds
+        stop_delay = self.config.stop_delay_seconds
+        IDLE = RecordingState.IDLE
+        RECORDING = RecordingState.RECORDING
+        WAITING_TO_STOP = RecordingState.WAITING_TO_STOP
+        presence_is_set = self._presence.is_set
+        recorder = self.recorder
+        leds = self.status_leds
+        wait = self._wait
+        monotonic = time.monotonic
+        
+        start_announced = False
+        next_tick = monotonic()
         try:
             while self.running:
-                presence = self.ir_sensor.detect_presence()
-                current_time = time.time()
+                presence = presence_is_set()
+                current_time = monotonic()  # Immune to NTP/wall-clock steps
+                state = self.state
                 
                 # State machine logic with LED indicators
-                if self.state == RecordingState.IDLE:
+                if state is IDLE:
                     if presence:
-                        logger.info("Presence detected! Starting recording...")
-                        if self.recorder.start_recording():
-                            self.state = RecordingState.RECORDING
-                            self.status_leds.set_recording()  # Turn on red LED
-                            self.absence_timer = None
+                        # Announced once per presence episode: start_recording
+                        # is retried every tick while muxer slots are busy
+                        if not start_announced:
+                            logger.info("Presence detected! Starting recording...")
+                            start_announced = True
+                        if recorder.start_recording():
+                            self.state = RECORDING
+                            leds.set_recording()  # Turn on red LED
+                            self._stop_deadline = None
+                            start_announced = False
+                    else:
+                        start_announced = False
                 
-                elif self.state == RecordingState.RECORDING:
+                elif state is RECORDING:
                     if not presence:
                         logger.info("Presence lost, starting countdown...")
-                        self.state = RecordingState.WAITING_TO_STOP
-                        self.status_leds.set_waiting()  # Keep red LED on during wait
-                        self.absence_timer = current_time
+                        self.state = WAITING_TO_STOP
+                        leds.set_waiting()  # Keep red LED on during wait
+                        self._stop_deadline = current_time + stop_delay
                 
-                elif self.state == RecordingState.WAITING_TO_STOP:
+                elif state is WAITING_TO_STOP:
                     if presence:
                         # Presence returned, cancel countdown
                         logger.info("Presence returned, canceling stop countdown")
-                        self.state = RecordingState.RECORDING
-                        self.status_leds.set_recording()  # Back to red LED
-                        self.absence_timer = None
-                    elif self.absence_timer is not None:
-                        elapsed = current_time - self.absence_timer
-                        if elapsed >= self.config.stop_delay_seconds:
-                            logger.info(f"No presence for {self.config.stop_delay_seconds}s, stopping recording")
-                            self.recorder.stop_recording()
-                            self.state = RecordingState.IDLE
-                            self.status_leds.set_idle()  # Back to orange LED
-                            self.absence_timer = None
+                        self.state = RECORDING
+                        leds.set_recording()  # Back to red LED
+                        self._stop_deadline = None
+                    elif self._stop_deadline is not None:
+                        if current_time >= self._stop_deadline:
+                            logger.info(f"No presence for {stop_delay}s, stopping recording")
+                            recorder.stop_recording()
+                            self.state = IDLE
+                            leds.set_idle()  # Back to orange LED
+                            self._stop_deadline = None
+                
+                # Idle with nobody present: nothing to do until the sensor
+                # thread reports a change (or a signal arrives)
+                if self.state is IDLE and not presence:
+                    wait(None)
+                    next_tick = monotonic()
+                    continue
                 
-                # Poll interval
-                time.sleep(self.config.poll_interval_seconds)
+                # Wait for the next tick (cut short when the sensor reports a change)
+                next_tick += poll_interval
+                delay = next_tick - monotonic()
+                if delay > 0:
+                    wait(delay)
+                else:
+                    next_tick = monotonic()  # Overran; don't try to catch up
                 
         except KeyboardInterrupt:
             logger.info("Interrupted by user")
         except Exception as e:
             logger.error(f"Unexpected error in main loop: {e}", exc_info=True)
         finally:
+            if self._signal_received is not None:
+                logger.info(f"Received signal {self._signal_received}, shutting down...")
             if self.recorder.is_recording():
                 logger.info("Stopping recording before exit...")
                 self.recorder.stop_recording()
+            self.recorder.close()
             self.status_leds.cleanup()  # Turn off LEDs on exit
+            signal.set_wakeup_fd(-1)
             logger.info("=== A/V Monitoring System Stopped ===")
 
 
 def main():
     """Entry point"""
+    listener = setup_logging()
     try:
         # Load configuration
-        config = Config()
+        config = Config.load()
         
         # Create and run monitor system
         monitor = MonitorSystem(config)
@@ -559,6 +898,8 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
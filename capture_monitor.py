@@ -20,21 +20,28 @@ Recording Behavior:
 import subprocess
 import time
 import logging
+import logging.handlers
+import os
+import queue
+import select
+import shutil
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
 import signal
 import sys
+from typing import Optional
 
 try:
-    import board
-    import busio
-    import adafruit_amg88xx
+    from ir_sensor import IRSensor  # Shared with av_monitor.py
 except ImportError as e:
     print("Error: Required libraries not installed.")
-    print("Please run: pip3 install adafruit-circuitpython-amg88xx")
+    print("Please run: pip3 install adafruit-circuitpython-amg88xx numpy")
     sys.exit(1)
 
+# Opened once and reused for spawned stdio instead of subprocess.DEVNULL
+_DEVNULL_FD = os.open(os.devnull, os.O_RDWR | os.O_CLOEXEC)
+
 
 # ============================================================================
 # CONFIGURATION
@@ -47,12 +54,14 @@ class Config:
     CAPTURE_DIR = Path.home() / "captures"
     
     # IR Sensor Thresholds
-    IR_PRESENCE_TEMP_MIN = 28.0  # Celsius - minimum temp to consider human
-    IR_PRESENCE_PIXEL_COUNT = 3   # Number of pixels above threshold to trigger
+    IR_PRESENCE_TEMP_MIN = 28.0  # Celsius - floor for the adaptive hot threshold
+    IR_PRESENCE_PIXEL_COUNT = 3   # Connected hot pixels needed to trigger
     IR_POLL_INTERVAL = 0.5        # Seconds between IR sensor reads
     
     # Recording Timing
     STOP_DELAY_SECONDS = 60       # Wait time after person leaves before stopping
+    RESTART_BACKOFF_SECONDS = 2   # First retry delay after rpicam-vid dies
+    RESTART_BACKOFF_MAX = 60      # Retry delay cap (doubles per failure)
     
     # Video Settings
     VIDEO_WIDTH = 1920
@@ -67,6 +76,7 @@ class Config:
     # Logging
     LOG_LEVEL = logging.INFO
     LOG_FILE = Path.home() / "capture_monitor.log"
+    RECORDER_LOG = Path.home() / "capture_monitor_rpicam.log"  # rpicam-vid stderr
 
 
 # ============================================================================
@@ -80,66 +90,6 @@ class RecordingState(Enum):
     COOLDOWN = "cooldown"        # Person left, counting down to stop
 
 
-# ============================================================================
-# IR SENSOR HANDLER
-# ============================================================================
-
-class IRSensor:
-    """Handles AMG8833 IR thermal sensor operations"""
-    
-    def __init__(self):
-        self.logger = logging.getLogger("IRSensor")
-        self.sensor = None
-        self._initialize()
-    
-    def _initialize(self):
-        """Initialize I²C connection to AMG8833"""
-        try:
-            i2c_bus = busio.I2C(board.SCL, board.SDA)
-            self.sensor = adafruit_amg88xx.AMG88XX(i2c_bus)
-            self.logger.info("AMG8833 IR sensor initialized (address 0x69)")
-        except Exception as e:
-            self.logger.error(f"Failed to initialize AMG8833: {e}")
-            self.logger.error("Check I²C connection and run: i2cdetect -y 1")
-            raise
-    
-    def detect_presence(self) -> bool:
-        """
-        Detect human presence based on thermal signature.
-        
-        Returns:
-            True if human-like heat signature detected, False otherwise
-        """
-        try:
-            # Read 8x8 thermal array
-            pixels = self.sensor.pixels
-            
-            # Count pixels above human body temperature threshold
-            hot_pixel_count = 0
-            max_temp = 0
-            
-            for row in pixels:
-                for temp in row:
-                    if temp > max_temp:
-                        max_temp = temp
-                    if temp >= Config.IR_PRESENCE_TEMP_MIN:
-                        hot_pixel_count += 1
-            
-            presence = hot_pixel_count >= Config.IR_PRESENCE_PIXEL_COUNT
-            
-            if presence:
-                self.logger.debug(
-                    f"Presence detected: {hot_pixel_count} hot pixels, "
-                    f"max temp: {max_temp:.1f}°C"
-                )
-            
-            return presence
-            
-        except Exception as e:
-            self.logger.error(f"Error reading IR sensor: {e}")
-            return False
-
-
 # ============================================================================
 # VIDEO RECORDER
 # ============================================================================
@@ -151,6 +101,45 @@ class AVRecorder:
         self.logger = logging.getLogger("AVRecorder")
         self.process = None
         self.current_filename = None
+        self._current_filepath = None  # str path of current_filename
+        self.exit_fd = None  # pidfd of the recording, readable once it exits
+        self._log = self._open_log()
+        
+        # Static rpicam-vid arguments, built once
+        # Using timeout 0 means record indefinitely until killed
+        self._cmd_base = (
+            "rpicam-vid",
+            "-t", "0",  # No timeout, record until stopped
+            "--width", str(Config.VIDEO_WIDTH),
+            "--height", str(Config.VIDEO_HEIGHT),
+            "--framerate", str(Config.VIDEO_FPS),
+            "--codec", Config.VIDEO_CODEC,
+            # Audio parameters
+            "--audio",
+            "--audio-codec", "aac",
+            "--audio-samplerate", str(Config.AUDIO_SAMPLE_RATE),
+            "--audio-channels", str(Config.AUDIO_CHANNELS),
+            # Disable preview (headless operation)
+            "-n",
+            # Errors only; per-frame output would grow RECORDER_LOG unbounded
+            "--verbose", "0",
+        )
+    
+    def _open_log(self):
+        """Open the rpicam-vid stderr log for appending (None if unavailable)"""
+        try:
+            return open(Config.RECORDER_LOG, "ab", buffering=0)
+        except OSError as e:
+            self.logger.warning(
+                "Cannot open %s, discarding rpicam-vid output: %s", Config.RECORDER_LOG, e
+            )
+            return None
+    
+    def close(self):
+        """Release the rpicam-vid log file"""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
     
     def start_recording(self) -> str:
         """
@@ -169,41 +158,29 @@ class AVRecorder:
         # Generate timestamped filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"rec_{timestamp}.mp4"
-        filepath = Config.CAPTURE_DIR / filename
+        filepath = os.fspath(Config.CAPTURE_DIR / filename)
         
-        # Build rpicam-vid command
-        # Using timeout 0 means record indefinitely until killed
-        cmd = [
-            "rpicam-vid",
-            "-t", "0",  # No timeout, record until stopped
-            "-o", str(filepath),
-            "--width", str(Config.VIDEO_WIDTH),
-            "--height", str(Config.VIDEO_HEIGHT),
-            "--framerate", str(Config.VIDEO_FPS),
-            "--codec", Config.VIDEO_CODEC,
-            # Audio parameters
-            "--audio",
-            "--audio-codec", "aac",
-            "--audio-samplerate", str(Config.AUDIO_SAMPLE_RATE),
-            "--audio-channels", str(Config.AUDIO_CHANNELS),
-            # Disable preview (headless operation)
-            "-n",
-        ]
+        # rpicam-vid command: only the output path varies per recording
+        cmd = (*self._cmd_base, "-o", filepath)
         
         try:
-            self.logger.info(f"Starting recording: {filename}")
-            self.logger.debug(f"Command: {' '.join(cmd)}")
+            self.logger.info("Starting recording: %s", filename)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Command: %s", ' '.join(cmd))
             
-            # Start recording process
+            # Start recording process. Never give it pipes nobody drains: a full
+            # pipe would block rpicam-vid. stderr goes to an append-only log.
+            # Without preexec_fn, Popen spawns via vfork (no page-table copy)
             self.process = subprocess.Popen(
                 cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+                stdout=_DEVNULL_FD,
+                stderr=self._log or _DEVNULL_FD
             )
+            self.exit_fd = os.pidfd_open(self.process.pid)
             
             self.current_filename = filename
-            self.logger.info(f"Recording started: {filename}")
+            self._current_filepath = filepath
+            self.logger.info("Recording started: %s", filename)
             
             return filename
             
@@ -213,60 +190,86 @@ class AVRecorder:
             )
             raise
         except Exception as e:
-            self.logger.error(f"Failed to start recording: {e}")
+            self.logger.error("Failed to start recording: %s", e)
             raise
     
     def stop_recording(self):
         """Stop current recording gracefully"""
         if not self.is_recording():
             self.logger.warning("Not recording, ignoring stop request")
+            self._reset()  # Release an already-exited process, if any
             return
         
         try:
-            self.logger.info(f"Stopping recording: {self.current_filename}")
+            self.logger.info("Stopping recording: %s", self.current_filename)
             
             # Send SIGINT for graceful shutdown (allows rpicam-vid to finalize MP4)
             self.process.send_signal(signal.SIGINT)
             
-            # Wait for process to complete (with timeout)
-            try:
-                stdout, stderr = self.process.communicate(timeout=10)
-                
-                if self.process.returncode == 0:
-                    self.logger.info(
-                        f"Recording stopped successfully: {self.current_filename}"
-                    )
-                else:
-                    self.logger.warning(
-                        f"Recording stopped with code {self.process.returncode}"
-                    )
-                    if stderr:
-                        self.logger.debug(f"stderr: {stderr}")
-                        
-            except subprocess.TimeoutExpired:
+            # Wait for the pidfd to report exit (with timeout), then reap
+            exit_poll = select.poll()
+            exit_poll.register(self.exit_fd, select.POLLIN)
+            if not exit_poll.poll(10_000):
                 self.logger.warning("Recording process did not stop gracefully, forcing kill")
-                self.process.kill()
-                self.process.wait()
+                signal.pidfd_send_signal(self.exit_fd, signal.SIGKILL)
+                exit_poll.poll()
+            self.process.wait()
             
-            # Get file size for confirmation
-            filepath = Config.CAPTURE_DIR / self.current_filename
-            if filepath.exists():
-                size_mb = filepath.stat().st_size / (1024 * 1024)
+            if self.process.returncode == 0:
                 self.logger.info(
-                    f"Saved: {self.current_filename} ({size_mb:.1f} MB)"
+                    "Recording stopped successfully: %s", self.current_filename
                 )
             else:
-                self.logger.error(f"Recording file not found: {filepath}")
+                self.logger.warning(
+                    "Recording stopped with code %s (details in %s)",
+                    self.process.returncode, Config.RECORDER_LOG
+                )
+            
+            # Get file size for confirmation (one stat doubles as the existence check)
+            try:
+                size_mb = os.stat(self._current_filepath).st_size / (1024 * 1024)
+                self.logger.info(
+                    "Saved: %s (%.1f MB)", self.current_filename, size_mb
+                )
+            except FileNotFoundError:
+                self.logger.error("Recording file not found: %s", self._current_filepath)
             
         except Exception as e:
-            self.logger.error(f"Error stopping recording: {e}")
+            self.logger.error("Error stopping recording: %s", e)
         finally:
-            self.process = None
-            self.current_filename = None
+            self._reset()
+    
+    def reap_exited(self):
+        """Clean up after the recording process exited on its own"""
+        try:
+            self.process.wait()
+            self.logger.error(
+                "Recording process exited unexpectedly with code %s: %s (details in %s)",
+                self.process.returncode, self.current_filename, Config.RECORDER_LOG
+            )
+        except Exception as e:
+            self.logger.error("Error reaping recording process: %s", e)
+        finally:
+            self._reset()
+    
+    def _reset(self):
+        """Forget the current recording process"""
+        if self.exit_fd is not None:
+            os.close(self.exit_fd)
+            self.exit_fd = None
+        self.process = None
+        self.current_filename = None
+        self._current_filepath = None
     
     def is_recording(self) -> bool:
-        """Check if currently recording"""
-        return self.process is not None and self.process.poll() is None
+        """
+        Check if currently recording
+        
+        No waitpid here: an exit is reported by exit_fd and cleared through
+        reap_exited() or stop_recording(), both safe on a process that has
+        already died.
+        """
+        return self.process is not None
 
 
 # ============================================================================
@@ -278,12 +281,33 @@ class CaptureMonitor:
     
     def __init__(self):
         self.logger = logging.getLogger("CaptureMonitor")
-        self.ir_sensor = IRSensor()
+        self.ir_sensor = IRSensor(
+            threshold=Config.IR_PRESENCE_TEMP_MIN,
+            min_pixels=Config.IR_PRESENCE_PIXEL_COUNT
+        )
         self.recorder = AVRecorder()
         
         self.state = RecordingState.IDLE
-        self.cooldown_start_time = None
+        self._cooldown_deadline_ns = None  # time.monotonic_ns() when COOLDOWN ends
+        # Restart backoff after rpicam-vid exits on its own (e.g. no camera)
+        self._restart_backoff_ns = 0
+        self._restart_after_ns = 0  # time.monotonic_ns() before which IDLE won't start
+        self._stop_delay_ns = int(Config.STOP_DELAY_SECONDS * 1_000_000_000)
+        # State machine: each handler returns the next state, or None to stay
+        self._handlers = {
+            RecordingState.IDLE: self._on_idle,
+            RecordingState.RECORDING: self._on_recording,
+            RecordingState.COOLDOWN: self._on_cooldown,
+        }
         self.running = False
+        self._signal_received = None
+        
+        # Event loop: sleeps until the next IR tick, a shutdown request,
+        # or the recording process exiting
+        self._ep = select.epoll()
+        # Self-pipe written by signal.set_wakeup_fd at delivery (any thread)
+        self._wake_r, self._wake_w = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        self._ep.register(self._wake_r, select.EPOLLIN)
         
         # Register signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -291,70 +315,152 @@ class CaptureMonitor:
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
-        self.logger.info(f"Received signal {signum}, shutting down...")
+        # The wake pipe is already readable, so epoll won't block; just
+        # tell the loop to exit and leave the logging to _cleanup()
+        self._signal_received = signum
         self.running = False
     
     def run(self):
         """Main monitoring loop"""
         self.logger.info("=== Capture Monitor Started ===")
-        self.logger.info(f"Capture directory: {Config.CAPTURE_DIR}")
-        self.logger.info(f"Video: {Config.VIDEO_WIDTH}x{Config.VIDEO_HEIGHT}@{Config.VIDEO_FPS}fps")
-        self.logger.info(f"Audio: {Config.AUDIO_SAMPLE_RATE}Hz, {Config.AUDIO_CHANNELS}ch")
-        self.logger.info(f"Stop delay: {Config.STOP_DELAY_SECONDS}s")
+        self.logger.info("Capture directory: %s", Config.CAPTURE_DIR)
+        self.logger.info(
+            "Video: %sx%s@%sfps", Config.VIDEO_WIDTH, Config.VIDEO_HEIGHT, Config.VIDEO_FPS
+        )
+        self.logger.info("Audio: %sHz, %sch", Config.AUDIO_SAMPLE_RATE, Config.AUDIO_CHANNELS)
+        self.logger.info("Stop delay: %ss", Config.STOP_DELAY_SECONDS)
         self.logger.info("=" * 40)
         
         self.running = True
+        # Make SIGINT/SIGTERM readable on _wake_r, even if delivered to another thread
+        signal.set_wakeup_fd(self._wake_w)
+        # Hot-loop lookups bound once as locals
+        update = self._update
+        poll = self._ep.poll
+        monotonic = time.monotonic
+        interval = Config.IR_POLL_INTERVAL
+        wake_r = self._wake_r
+        recorder = self.recorder
+        next_tick = monotonic()
         
         try:
             while self.running:
-                self._update()
-                time.sleep(Config.IR_POLL_INTERVAL)
+                timeout = max(0.0, next_tick - monotonic())
+                for fd, _ in poll(timeout):
+                    if fd == wake_r:
+                        self._drain_wakeups()
+                        self.running = False
+                    elif fd == recorder.exit_fd:
+                        self._on_recorder_exit()
+                if not self.running:
+                    break
+                
+                now = monotonic()
+                if now >= next_tick:
+                    update()
+                    # Fixed cadence; after an overrun, restart from now
+                    next_tick = max(next_tick + interval, now)
                 
         except Exception as e:
-            self.logger.error(f"Fatal error in main loop: {e}", exc_info=True)
+            self.logger.error("Fatal error in main loop: %s", e, exc_info=True)
         finally:
             self._cleanup()
     
     def _update(self):
         """Single iteration of the monitoring loop"""
         presence = self.ir_sensor.detect_presence()
+        next_state = self._handlers[self.state](presence)
+        if next_state is not None:
+            self.state = next_state
+    
+    def _on_idle(self, presence: bool) -> Optional[RecordingState]:
+        """IDLE: start recording when someone appears"""
+        if presence and time.monotonic_ns() >= self._restart_after_ns:
+            self.logger.info("Presence detected → Starting recording")
+            self._start_recording()
+            return RecordingState.RECORDING
+        return None
+    
+    def _on_recording(self, presence: bool) -> Optional[RecordingState]:
+        """RECORDING: start the cooldown when presence is lost"""
+        if not presence:
+            self.logger.info(
+                "Presence lost → Cooldown started (%ss)", Config.STOP_DELAY_SECONDS
+            )
+            self._cooldown_deadline_ns = time.monotonic_ns() + self._stop_delay_ns
+            return RecordingState.COOLDOWN
+        return None
+    
+    def _on_cooldown(self, presence: bool) -> Optional[RecordingState]:
+        """COOLDOWN: resume on presence, stop once the delay has passed"""
+        if presence:
+            # Person returned, resume recording
+            self.logger.info("Presence detected again → Resuming recording")
+            self._cooldown_deadline_ns = None
+            return RecordingState.RECORDING
         
-        if self.state == RecordingState.IDLE:
-            if presence:
-                self.logger.info("Presence detected → Starting recording")
-                self.recorder.start_recording()
-                self.state = RecordingState.RECORDING
-        
-        elif self.state == RecordingState.RECORDING:
-            if not presence:
-                self.logger.info(
-                    f"Presence lost → Cooldown started ({Config.STOP_DELAY_SECONDS}s)"
-                )
-                self.cooldown_start_time = time.time()
-                self.state = RecordingState.COOLDOWN
+        # Check if cooldown period has elapsed
+        if time.monotonic_ns() >= self._cooldown_deadline_ns:
+            self.logger.info("Cooldown complete → Stopping recording")
+            self._stop_recording()
+            self._cooldown_deadline_ns = None
+            self._restart_backoff_ns = 0  # A full recording: rpicam-vid is healthy
+            return RecordingState.IDLE
+        return None
+    
+    def _start_recording(self):
+        """Start recording and watch the process for an unexpected exit"""
+        self.recorder.start_recording()
+        if self.recorder.exit_fd is not None:
+            self._ep.register(self.recorder.exit_fd, select.EPOLLIN)
+    
+    def _stop_recording(self):
+        """Stop watching the recording process, then stop it"""
+        if self.recorder.exit_fd is not None:
+            self._ep.unregister(self.recorder.exit_fd)
+        self.recorder.stop_recording()
+    
+    def _on_recorder_exit(self):
+        """Recording process died without being stopped: back to idle"""
+        self._ep.unregister(self.recorder.exit_fd)
+        self.recorder.reap_exited()
+        self.state = RecordingState.IDLE
+        self._cooldown_deadline_ns = None
         
-        elif self.state == RecordingState.COOLDOWN:
-            if presence:
-                # Person returned, resume recording
-                self.logger.info("Presence detected again → Resuming recording")
-                self.state = RecordingState.RECORDING
-                self.cooldown_start_time = None
-            else:
-                # Check if cooldown period has elapsed
-                elapsed = time.time() - self.cooldown_start_time
-                if elapsed >= Config.STOP_DELAY_SECONDS:
-                    self.logger.info("Cooldown complete → Stopping recording")
-                    self.recorder.stop_recording()
-                    self.state = RecordingState.IDLE
-                    self.cooldown_start_time = None
+        # Don't respawn a failing rpicam-vid on every tick while presence lasts
+        self._restart_backoff_ns = min(
+            max(2 * self._restart_backoff_ns, Config.RESTART_BACKOFF_SECONDS * 1_000_000_000),
+            Config.RESTART_BACKOFF_MAX * 1_000_000_000,
+        )
+        self._restart_after_ns = time.monotonic_ns() + self._restart_backoff_ns
+        self.logger.warning(
+            "Next recording attempt in %ss", self._restart_backoff_ns // 1_000_000_000
+        )
+    
+    def _drain_wakeups(self):
+        """Empty the self-pipe after a signal woke the event loop"""
+        try:
+            while os.read(self._wake_r, 512):
+                pass
+        except BlockingIOError:
+            pass
     
     def _cleanup(self):
         """Cleanup on shutdown"""
+        # Logged here whichever way the loop noticed the signal
+        if self._signal_received is not None:
+            self.logger.info("Received signal %s, shutting down...", self._signal_received)
         self.logger.info("Cleaning up...")
         
         if self.recorder.is_recording():
             self.logger.info("Stopping active recording...")
-            self.recorder.stop_recording()
+            self._stop_recording()
+        
+        self.recorder.close()
+        self._ep.close()
+        signal.set_wakeup_fd(-1)
+        os.close(self._wake_r)
+        os.close(self._wake_w)
         
         self.logger.info("=== Capture Monitor Stopped ===")
 
@@ -363,8 +469,16 @@ class CaptureMonitor:
 # LOGGING SETUP
 # ============================================================================
 
-def setup_logging():
-    """Configure logging to file and console"""
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Configure logging to file and console
+    
+    Callers only enqueue records; a listener thread does the file and
+    console writes, so a slow disk never stalls the IR polling loop.
+    
+    Returns:
+        The started listener; stop it on exit to flush pending records
+    """
     
     # Create formatters
     detailed_formatter = logging.Formatter(
@@ -387,11 +501,22 @@ def setup_logging():
     console_handler.setLevel(Config.LOG_LEVEL)
     console_handler.setFormatter(simple_formatter)
     
-    # Root logger
+    # Root logger feeds the queue; the listener applies handler levels
+    log_queue = queue.SimpleQueue()
     root_logger = logging.getLogger()
     root_logger.setLevel(Config.LOG_LEVEL)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    # The formats don't use thread/process fields; skip collecting them
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    return listener
 
 
 # ============================================================================
@@ -400,8 +525,15 @@ def setup_logging():
 
 def main():
     """Main entry point"""
-    setup_logging()
-    
+    listener = setup_logging()
+    try:
+        return _run()
+    finally:
+        listener.stop()
+
+
+def _run():
+    """Pre-flight checks, then monitor until stopped"""
     logger = logging.getLogger("Main")
     
     # Pre-flight checks
@@ -410,29 +542,21 @@ def main():
     # Check if capture directory is writable
     try:
         Config.CAPTURE_DIR.mkdir(parents=True, exist_ok=True)
-        test_file = Config.CAPTURE_DIR / ".test"
-        test_file.touch()
-        test_file.unlink()
-        logger.info(f"✓ Capture directory writable: {Config.CAPTURE_DIR}")
     except Exception as e:
         logger.error(f"✗ Cannot write to capture directory: {e}")
         return 1
+    # Permission/read-only check without creating and deleting a file
+    if not os.access(Config.CAPTURE_DIR, os.W_OK | os.X_OK):
+        logger.error(f"✗ Cannot write to capture directory: {Config.CAPTURE_DIR}")
+        return 1
+    logger.info(f"✓ Capture directory writable: {Config.CAPTURE_DIR}")
     
-    # Check if rpicam-vid is available
-    try:
-        result = subprocess.run(
-            ["rpicam-vid", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        logger.info(f"✓ rpicam-vid found: {result.stdout.strip()}")
-    except FileNotFoundError:
+    # Check if rpicam-vid is available (PATH lookup; no process spawned)
+    rpicam_vid = shutil.which("rpicam-vid")
+    if rpicam_vid is None:
         logger.error("✗ rpicam-vid not found. Install rpicam-apps.")
         return 1
-    except Exception as e:
-        logger.error(f"✗ Error checking rpicam-vid: {e}")
-        return 1
+    logger.info(f"✓ rpicam-vid found: {rpicam_vid}")
     
     logger.info("Pre-flight checks complete\n")
     
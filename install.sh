@@ -136,13 +136,13 @@ fi
 
 # Create log directory
 mkdir -p /var/log
-touch /var/log/av_monitor.log
-chown "$ACTUAL_USER:$ACTUAL_USER" /var/log/av_monitor.log
+touch /var/log/av_monitor.log /var/log/av_monitor_rpicam.log
+chown "$ACTUAL_USER:$ACTUAL_USER" /var/log/av_monitor.log /var/log/av_monitor_rpicam.log
 
-# Copy main script to user directory
+# Copy main script (and the shared IR sensor module) to user directory
 INSTALL_DIR="$USER_HOME/Monitor"
 mkdir -p "$INSTALL_DIR"
-cp av_monitor.py "$INSTALL_DIR/"
+cp av_monitor.py ir_sensor.py "$INSTALL_DIR/"
 chmod +x "$INSTALL_DIR/av_monitor.py"
 chown -R "$ACTUAL_USER:$ACTUAL_USER" "$INSTALL_DIR"
 
@@ -0,0 +1,388 @@
+"""
+AMG8833 IR thermal sensor shared by av_monitor.py and capture_monitor.py
+
+Frames are burst-read over I2C into preallocated buffers and classified
+with an adaptive (Otsu) threshold, a connected-region size test and a
+debounced hot-pixel count. The per-frame kernels are compiled with numba
+when it is installed.
+"""
+
+import logging
+from typing import Optional
+
+import board
+import busio
+import adafruit_amg88xx
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Optional: IRSensor falls back to the NumPy path
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+
+OTSU_BINS = 16
+# Otsu always splits the histogram, even a background-only frame; below
+# this gap between the two class means (°C) the frame has no foreground
+MIN_CLASS_SEPARATION = 2.0
+GRID_WIDTH = 8  # AMG8833 pixels per row
+
+
+def _ir_kernel(raw_q, floor_q, ema_q, has_ema, alpha, mask):
+    """
+    Otsu threshold, EMA update and hot-pixel count in a single pass
+
+    Works in raw sensor units (0.25°C per LSB) and mirrors
+    IRSensor._otsu_threshold plus the NumPy counting path. A frame whose
+    classes are closer than MIN_CLASS_SEPARATION has no hot pixels and
+    leaves the EMA untouched.
+
+    Args:
+        raw_q: 64 sign-extended int16 pixel readings
+        floor_q: Minimum threshold
+        ema_q: Previous smoothed threshold (ignored unless has_ema)
+        has_ema: Whether ema_q holds a previous value
+        alpha: EMA weight of the newest Otsu estimate
+        mask: 64-element bool output, set where a pixel is hot
+
+    Returns:
+        (hot_count, new_ema_q, separated)
+    """
+    n = raw_q.size
+    lo = raw_q[0]
+    hi = raw_q[0]
+    for i in range(1, n):
+        if raw_q[i] < lo:
+            lo = raw_q[i]
+        elif raw_q[i] > hi:
+            hi = raw_q[i]
+    lo_f = float(lo)
+    hi_f = float(hi)
+    if lo_f == hi_f:
+        # Same widening as np.histogram (±0.5°C)
+        lo_f -= 2.0
+        hi_f += 2.0
+    width = (hi_f - lo_f) / OTSU_BINS
+
+    hist = np.zeros(OTSU_BINS, dtype=np.int64)
+    for i in range(n):
+        b = int((raw_q[i] - lo_f) / width)
+        if b >= OTSU_BINS:
+            b = OTSU_BINS - 1
+        hist[b] += 1
+
+    mu_total = 0.0
+    for k in range(OTSU_BINS):
+        mu_total += hist[k] / n * (lo_f + (k + 0.5) * width)
+
+    w0 = 0.0
+    mu = 0.0
+    best = -1.0
+    best_k = 0
+    best_w0 = 0.0
+    best_mu = 0.0
+    for k in range(OTSU_BINS):
+        p = hist[k] / n
+        w0 += p
+        mu += p * (lo_f + (k + 0.5) * width)
+        w1 = 1.0 - w0
+        denom = w0 * w1
+        sigma_b2 = (mu_total * w0 - mu) ** 2 / denom if denom > 0.0 else 0.0
+        if sigma_b2 > best:
+            best = sigma_b2
+            best_k = k
+            best_w0 = w0
+            best_mu = mu
+
+    # Background-only frame: no foreground at all
+    best_w1 = 1.0 - best_w0
+    if best_w0 * best_w1 <= 0.0 or (
+        (mu_total - best_mu) / best_w1 - best_mu / best_w0
+        < MIN_CLASS_SEPARATION * 4.0
+    ):
+        for i in range(n):
+            mask[i] = False
+        return 0, ema_q, False
+    t_q = lo_f + (best_k + 1) * width
+
+    ema_q = (1.0 - alpha) * ema_q + alpha * t_q if has_ema else t_q
+    thr = max(floor_q, ema_q)
+
+    hot = 0
+    for i in range(n):
+        mask[i] = raw_q[i] >= thr
+        if mask[i]:
+            hot += 1
+    return hot, ema_q, True
+
+
+def _largest_blob(mask):
+    """
+    Size of the largest 8-connected group of hot pixels
+
+    Scattered noise pixels never form a large group, while a person shows
+    up as one contiguous warm region.
+
+    Args:
+        mask: 64-element bool array (row-major 8x8)
+
+    Returns:
+        Pixel count of the largest connected component
+    """
+    n = mask.size
+    seen = np.zeros(n, dtype=np.bool_)
+    stack = np.empty(n, dtype=np.int64)
+    best = 0
+    for start in range(n):
+        if not mask[start] or seen[start]:
+            continue
+        seen[start] = True
+        stack[0] = start
+        top = 1
+        size = 0
+        while top > 0:
+            top -= 1
+            i = stack[top]
+            size += 1
+            r = i // GRID_WIDTH
+            c = i % GRID_WIDTH
+            for dr in range(-1, 2):
+                for dc in range(-1, 2):
+                    rr = r + dr
+                    cc = c + dc
+                    if 0 <= rr < n // GRID_WIDTH and 0 <= cc < GRID_WIDTH:
+                        j = rr * GRID_WIDTH + cc
+                        if mask[j] and not seen[j]:
+                            seen[j] = True
+                            stack[top] = j
+                            top += 1
+        if size > best:
+            best = size
+    return best
+
+
+if njit is not None:
+    _ir_kernel = njit(cache=True, fastmath=True)(_ir_kernel)
+    _largest_blob = njit(cache=True)(_largest_blob)
+
+
+class IRSensor:
+    """AMG8833 IR thermal sensor interface"""
+    # AMG8833 interrupt registers (not exposed by adafruit_amg88xx)
+    _REG_SCLR = 0x05   # Status clear
+    _REG_INTC = 0x03   # Interrupt control
+    _REG_INTHL = 0x08  # Upper limit, low byte (INTHH follows)
+    _REG_INTLL = 0x0A  # Lower limit, low byte (INTLH follows)
+    _REG_INT_TABLE = 0x10  # 8 bytes, one bit per pixel that tripped INT
+    _REG_PIXELS = 0x80  # First of 64 little-endian 12-bit pixel words
+    _INTC_ENABLE_ABSOLUTE = 0x03  # INTEN | INTMOD (absolute value mode)
+    _SCLR_ALL = 0x0E  # OVT_CLR | OVS_CLR | INTCLR
+    
+    def __init__(self, threshold: float = 28.0, min_pixels: int = 3,
+                 interrupt: bool = False):
+        self.threshold = threshold  # Floor for the adaptive threshold
+        self.min_pixels = min_pixels
+        self.interrupt = interrupt  # Drive the INT pin on threshold crossing
+        self._thr = np.float32(threshold)
+        self.ema_t: Optional[float] = None  # Smoothed Otsu threshold
+        self.alpha = 0.2  # EMA weight of the newest Otsu estimate
+        # Debounce: EMA of the hot-pixel count with a one-pixel hysteresis band.
+        # A steady count of min_pixels only approaches min_pixels, so rise
+        # half a pixel below it.
+        self.hot_ema = 0.0
+        self.count_alpha = 0.3
+        self._rise_level = min_pixels - 0.5
+        self._fall_level = max(min_pixels - 1.5, self._rise_level / 2)
+        self._present = False
+        # Frame workspaces reused by every poll (no per-read allocation)
+        self._raw_buf = bytearray(128)
+        self._raw_view = np.frombuffer(self._raw_buf, dtype='<i2')
+        self._raw = np.empty(64, dtype=np.int16)
+        self._temps = np.empty(64, dtype=np.float32)
+        self._mask = np.empty(64, dtype=bool)
+        self._reg_pixels = bytes((self._REG_PIXELS,))
+        self.sensor = None
+        self.initialize()
+        if njit is not None:
+            # Pay the JIT compile (or cache load) before monitoring starts
+            _ir_kernel(np.zeros(64, dtype=np.int16), 0.0, 0.0, False, self.alpha, self._mask)
+            _largest_blob(self._mask)
+            logger.info("IR kernel compiled with numba")
+    
+    def initialize(self):
+        """Initialize I2C connection to AMG8833"""
+        try:
+            i2c = busio.I2C(board.SCL, board.SDA)
+            # The Adafruit driver handles reset/mode setup; frames are read
+            # directly through its I2C device (address 0x69)
+            self.sensor = adafruit_amg88xx.AMG88XX(i2c)
+            self._dev = self.sensor.i2c_device
+            if self.interrupt:
+                self._enable_interrupt()
+            logger.info("AMG8833 IR sensor initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize AMG8833: {e}")
+            raise
+    
+    def _write_register(self, register: int, *values: int):
+        """Write consecutive AMG8833 registers starting at register"""
+        with self._dev as device:
+            device.write(bytes((register, *values)))
+    
+    def _enable_interrupt(self):
+        """Assert INT whenever any pixel rises above the threshold"""
+        # Limits are 12-bit two's complement in 0.25°C steps
+        upper = int(round(self.threshold / 0.25)) & 0x0FFF
+        lower = 0x0800  # Most negative value, never crossed
+        self._write_register(self._REG_INTHL, upper & 0xFF, upper >> 8)
+        self._write_register(self._REG_INTLL, lower & 0xFF, lower >> 8)
+        self._write_register(self._REG_INTC, self._INTC_ENABLE_ABSOLUTE)
+        self.clear_interrupt()
+        logger.info(f"AMG8833 interrupt enabled at {self.threshold}°C")
+    
+    def interrupt_pixel_count(self) -> int:
+        """Number of pixels flagged in the interrupt table (0 on error)"""
+        try:
+            table = bytearray(8)
+            with self._dev as device:
+                device.write_then_readinto(bytes((self._REG_INT_TABLE,)), table)
+            return int.from_bytes(table, 'little').bit_count()
+        except Exception as e:
+            logger.error(f"Error reading IR sensor interrupt table: {e}")
+            return 0
+    
+    def clear_interrupt(self):
+        """Release the INT line so the next crossing re-asserts it"""
+        try:
+            self._write_register(self._REG_SCLR, self._SCLR_ALL)
+        except Exception as e:
+            logger.error(f"Error clearing IR sensor interrupt: {e}")
+    
+    def read_raw(self) -> np.ndarray:
+        """
+        Read all 64 pixels in one burst transfer
+        
+        Returns:
+            Flat int16 array in sensor units (0.25°C per LSB, row-major 8x8).
+            The array is reused and overwritten by the next read.
+        """
+        with self._dev as device:
+            device.write_then_readinto(self._reg_pixels, self._raw_buf)
+        # Sign-extend the 12-bit two's complement values
+        np.left_shift(self._raw_view, 4, out=self._raw)
+        np.right_shift(self._raw, 4, out=self._raw)
+        return self._raw
+    
+    def read_pixels(self) -> np.ndarray:
+        """
+        Read all 64 pixels in one burst transfer
+        
+        Returns:
+            Flat array of 64 temperatures in °C (row-major 8x8 grid).
+            The array is reused and overwritten by the next read.
+        """
+        return np.multiply(self.read_raw(), np.float32(0.25), out=self._temps)
+    
+    @staticmethod
+    def _otsu_threshold(arr: np.ndarray, bins: int = OTSU_BINS) -> Optional[float]:
+        """
+        Select the threshold that maximizes between-class variance
+        
+        Args:
+            arr: Thermal grid in °C
+            bins: Histogram resolution
+        
+        Returns:
+            Temperature (°C) separating background from warm objects, or
+            None if the class means are closer than MIN_CLASS_SEPARATION
+        """
+        hist, edges = np.histogram(arr, bins=bins)
+        p = hist / arr.size
+        centers = (edges[:-1] + edges[1:]) / 2
+        
+        w0 = np.cumsum(p)  # Background class weight
+        w1 = 1.0 - w0      # Foreground class weight
+        mu = np.cumsum(p * centers)
+        mu_total = mu[-1]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sigma_b2 = (mu_total * w0 - mu) ** 2 / (w0 * w1)
+        sigma_b2 = np.nan_to_num(sigma_b2, nan=0.0, posinf=0.0)
+        k = int(np.argmax(sigma_b2))
+        
+        # Background-only frame: no foreground at all
+        if w0[k] * w1[k] <= 0.0 or (
+            (mu_total - mu[k]) / w1[k] - mu[k] / w0[k] < MIN_CLASS_SEPARATION
+        ):
+            return None
+        
+        # Split at the upper edge of the last background bin
+        return float(edges[k + 1])
+    
+    def detect_presence(self) -> bool:
+        """
+        Detect human presence based on thermal signature
+        
+        Returns:
+            True if human-like heat signature detected, False otherwise
+        """
+        try:
+            if njit is not None:
+                # Compiled single pass over the raw 0.25°C readings
+                hot_pixels, ema_q, separated = _ir_kernel(
+                    self.read_raw(), self.threshold * 4.0,
+                    (self.ema_t or 0.0) * 4.0, self.ema_t is not None, self.alpha,
+                    self._mask
+                )
+                if separated:
+                    self.ema_t = ema_q / 4.0
+                threshold = max(self.threshold, self.ema_t or 0.0)
+            else:
+                # Read 8x8 thermal grid
+                arr = self.read_pixels()
+                
+                # Adapt threshold to the scene, smoothed over time
+                t_star = self._otsu_threshold(arr)
+                if t_star is None:
+                    # Uniform frame: nothing is hot however warm the room
+                    self._mask.fill(False)
+                    hot_pixels = 0
+                    threshold = max(self.threshold, self.ema_t or 0.0)
+                else:
+                    if self.ema_t is None:
+                        self.ema_t = t_star
+                    else:
+                        self.ema_t = (1 - self.alpha) * self.ema_t + self.alpha * t_star
+                    threshold = max(self._thr, np.float32(self.ema_t))
+                    
+                    # Count pixels above threshold (single vectorized compare)
+                    np.greater_equal(arr, threshold, out=self._mask)
+                    hot_pixels = int(np.count_nonzero(self._mask))
+            
+            # Only a contiguous warm region counts; isolated noise pixels don't.
+            # Even a sub-min_pixels count must be reduced: scattered pixels
+            # fed in raw could hold the EMA above the fall level indefinitely.
+            # Zero or one hot pixel already equals its largest blob.
+            if hot_pixels > 1:
+                hot_pixels = int(_largest_blob(self._mask))
+            
+            # Smooth over time so a single-frame spike can't start a recording
+            self.hot_ema += self.count_alpha * (hot_pixels - self.hot_ema)
+            if self._present:
+                self._present = self.hot_ema >= self._fall_level
+            else:
+                self._present = self.hot_ema >= self._rise_level
+            
+            if self._present and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Presence detected: %d-pixel region above %.1f°C (smoothed %.1f)",
+                    hot_pixels, threshold, self.hot_ema
+                )
+            
+            return self._present
+            
+        except Exception as e:
+            logger.error(f"Error reading IR sensor: {e}")
+            return False
@@ -19,6 +19,7 @@ def test_imports():
         ("board", "GPIO board support"),
         ("busio", "I2C/SPI support"),
         ("adafruit_amg88xx", "AMG8833 sensor library"),
+        ("numpy", "Array math for thermal frames"),
     ]
     
     passed = 0
@@ -44,6 +45,7 @@ def test_ir_sensor():
         import board
         import busio
         import adafruit_amg88xx
+        import numpy as np
         
         print("Initializing I2C...")
         i2c = busio.I2C(board.SCL, board.SDA)
@@ -53,29 +55,30 @@ def test_ir_sensor():
         
         print("✓ AMG8833 initialized successfully\n")
         
-        # Read temperature grid
+        # Read temperature grid: all 64 pixels (registers 0x80-0xFF) in one
+        # burst, the same path the monitors use
         print("Reading thermal grid (8x8)...")
-        pixels = sensor.pixels
+        buf = bytearray(128)
+        with sensor.i2c_device as device:
+            device.write_then_readinto(bytes((0x80,)), buf)
+        # 12-bit two's complement, 0.25°C per LSB
+        raw = np.frombuffer(buf, dtype='<i2')
+        temps = (((raw << 4) >> 4) * 0.25).reshape(8, 8)
         
         print("\nThermal Map (°C):")
         print("-" * 60)
         
-        temps = []
-        for row_idx, row in enumerate(pixels):
-            row_str = f"Row {row_idx}: "
-            for temp in row:
-                row_str += f"{temp:5.1f} "
-                temps.append(temp)
-            print(row_str)
+        for row_idx, row in enumerate(temps):
+            print(f"Row {row_idx}: " + " ".join(f"{temp:5.1f}" for temp in row))
         
         print("-" * 60)
-        print(f"Min Temperature: {min(temps):.1f}°C")
-        print(f"Max Temperature: {max(temps):.1f}°C")
-        print(f"Avg Temperature: {sum(temps)/len(temps):.1f}°C")
+        print(f"Min Temperature: {temps.min():.1f}°C")
+        print(f"Max Temperature: {temps.max():.1f}°C")
+        print(f"Avg Temperature: {temps.mean():.1f}°C")
         
         # Test presence detection
         threshold = 28.0
-        hot_pixels = sum(1 for t in temps if t >= threshold)
+        hot_pixels = int(np.count_nonzero(temps >= threshold))
         print(f"\nPixels above {threshold}°C threshold: {hot_pixels}")
         
         if hot_pixels >= 3:
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+IR Kernel Consistency Checks
+
+ir_sensor.py has two presence paths that must agree: the single-pass
+_ir_kernel (numba-compiled when available) and the NumPy path built on
+IRSensor._otsu_threshold. This script checks them against each other, and
+_largest_blob against a plain flood fill, on synthetic frames. No sensor
+or I2C traffic is needed; run it after editing either path.
+"""
+
+import sys
+from collections import deque
+
+import numpy as np
+
+from ir_sensor import (
+    GRID_WIDTH,
+    IRSensor,
+    _ir_kernel,
+    _largest_blob,
+    njit,
+)
+
+FRAMES = 3000
+FLOOR = 28.0  # Default temperature_threshold
+ALPHA = 0.2   # IRSensor's EMA weight
+SEED = 8833
+
+
+def _random_frames(count: int, rng: np.random.Generator):
+    """Yield raw int16 frames: uniform backgrounds, half with warm regions"""
+    for i in range(count):
+        background = rng.uniform(18.0, 32.0)
+        temps = rng.normal(background, rng.uniform(0.2, 2.0), 64)
+        if i % 2:
+            hot = rng.integers(0, 64, rng.integers(1, 20))
+            temps[hot] += rng.uniform(0.0, 8.0)
+        yield np.round(temps * 4).astype(np.int16)
+
+
+def _reference_blob(mask: np.ndarray) -> int:
+    """Largest 8-connected component by breadth-first search"""
+    rows = mask.size // GRID_WIDTH
+    seen = set()
+    best = 0
+    for start in np.flatnonzero(mask):
+        if start in seen:
+            continue
+        seen.add(start)
+        queue = deque([start])
+        size = 0
+        while queue:
+            i = queue.popleft()
+            size += 1
+            r, c = divmod(int(i), GRID_WIDTH)
+            for rr in range(max(r - 1, 0), min(r + 2, rows)):
+                for cc in range(max(c - 1, 0), min(c + 2, GRID_WIDTH)):
+                    j = rr * GRID_WIDTH + cc
+                    if mask[j] and j not in seen:
+                        seen.add(j)
+                        queue.append(j)
+        best = max(best, size)
+    return best
+
+
+def test_threshold_parity():
+    """_ir_kernel and the NumPy path agree on separation and hot count"""
+    rng = np.random.default_rng(SEED)
+    mask = np.empty(64, dtype=bool)
+    floor = np.float32(FLOOR)
+    mismatches = 0
+    separated_frames = 0
+    
+    for raw in _random_frames(FRAMES, rng):
+        hot, _, separated = _ir_kernel(raw, FLOOR * 4.0, 0.0, False, ALPHA, mask)
+        temps = raw.astype(np.float32) * np.float32(0.25)
+        t_star = IRSensor._otsu_threshold(temps)
+        
+        if separated != (t_star is not None):
+            mismatches += 1
+            continue
+        if not separated:
+            if hot or mask.any():
+                mismatches += 1
+            continue
+        separated_frames += 1
+        expected = temps >= max(floor, np.float32(t_star))
+        if hot != int(np.count_nonzero(expected)) or not np.array_equal(mask, expected):
+            mismatches += 1
+    
+    print(f"Frames: {FRAMES}, with foreground: {separated_frames}, mismatches: {mismatches}")
+    assert mismatches == 0, f"{mismatches} frames disagree between the two paths"
+    # Both branches must actually be exercised
+    assert 0 < separated_frames < FRAMES
+
+
+def test_ema_update():
+    """_ir_kernel's EMA matches the NumPy path's update"""
+    rng = np.random.default_rng(SEED + 1)
+    mask = np.empty(64, dtype=bool)
+    previous = 29.0
+    
+    for raw in _random_frames(200, rng):
+        _, ema_q, separated = _ir_kernel(raw, FLOOR * 4.0, previous * 4.0, True, ALPHA, mask)
+        t_star = IRSensor._otsu_threshold(raw.astype(np.float32) * np.float32(0.25))
+        if not separated:
+            assert ema_q == previous * 4.0, "EMA changed on a frame with no foreground"
+            continue
+        expected = (1 - ALPHA) * previous + ALPHA * t_star
+        assert np.isclose(ema_q / 4.0, expected, atol=1e-4), (ema_q / 4.0, expected)
+
+
+def test_largest_blob():
+    """_largest_blob matches a reference flood fill"""
+    rng = np.random.default_rng(SEED + 2)
+    for _ in range(FRAMES):
+        mask = rng.random(64) < rng.uniform(0.05, 0.6)
+        assert _largest_blob(mask) == _reference_blob(mask), mask.reshape(8, 8)
+
+
+def main():
+    """Run all checks"""
+    print("IR Kernel Consistency Checks")
+    print("=" * 60)
+    print(f"Kernels: {'numba' if njit is not None else 'pure Python (numba not installed)'}")
+    print()
+    
+    checks = (test_threshold_parity, test_ema_update, test_largest_blob)
+    passed = 0
+    for check in checks:
+        try:
+            check()
+            print(f"✓ {check.__doc__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {check.__doc__} - {e}")
+    
+    print(f"\nPassed: {passed}/{len(checks)}")
+    return 0 if passed == len(checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
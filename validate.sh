@@ -144,6 +144,15 @@ else
     echo "  Install with: pip3 install -r requirements.txt"
     ((FAIL++))
 fi
+
+if python3 -c "import numpy" 2> /dev/null; then
+    echo -e "${GREEN}✓${NC} numpy installed"
+    ((PASS++))
+else
+    echo -e "${RED}✗${NC} numpy not found"
+    echo "  Install with: pip3 install -r requirements.txt"
+    ((FAIL++))
+fi
 echo ""
 
 # ============================================